@@ -10,6 +10,7 @@
 #                                    IMPORTS                                   #
 ################################################################################
 
+from math import ceil
 from tkinter import *
 
 from modules.bitmapfile import *
@@ -95,6 +96,38 @@ def button2_click():
         print(f"Open Error: {pic.err_lst()[0][0]}")
 
 
+################################################################################
+
+def button3_click():
+    # Description
+    # ------------------------------------------------------
+    pic = Bmpfile()
+
+    print("\nopen, to_photoimage")
+    print("############################################################")
+
+    p = f"Tst/Palette_08_16x16.bmp"
+    if pic.open(p):
+
+        # One pixel every (step) for big bitmaps, zoom for small ones (Preview up to 512 pixels)
+        step = max(1, ceil(max(pic.bmpwdth, pic.bmphght) / 512))
+        zoom = max(1, 512 // max(pic.bmpwdth, pic.bmphght))
+
+        preview = Toplevel(userform)
+        preview.title(f"Preview: {pic.filebasename()}")
+        preview.config(background='#404040')
+
+        img = pic.to_photoimage(step, preview).zoom(zoom)
+        label = Label(preview, image=img, bg='#404040')
+        label.image = img  # Keep image reference
+        label.pack(padx=20, pady=20)
+
+        print(f"Preview: {pic.bmpwdth}x{pic.bmphght}, Step: {step}, Zoom: {zoom}")
+
+    else:
+        print(f"Open Error: {pic.err_lst()[0][0]}")
+
+
 ################################################################################
 #                                     MAIN                                     #
 ################################################################################
@@ -102,7 +135,7 @@ def button2_click():
 # Create UserForm (Tkinter Window)
 userform = Tk()
 userform.title("Bitmap Class Usage")
-userform.geometry("740x150")
+userform.geometry("1100x150")
 userform.resizable(width=False, height=False)
 userform.config(background='#404040')
 
@@ -118,6 +151,10 @@ button1.grid(row=0, column=0, padx=20)
 button2 = Button(frame, text="Open, Info, Pixelcolor", font=("Arial", 20), bg='#808080', fg='#101010', command=button2_click)
 button2.grid(row=0, column=1, padx=20)
 
+# Create Button in Frame
+button3 = Button(frame, text="Open, Preview", font=("Arial", 20), bg='#808080', fg='#101010', command=button3_click)
+button3.grid(row=0, column=2, padx=20)
+
 # Display UserForm
 userform.mainloop()
 
@@ -0,0 +1,277 @@
+
+################################################################################
+#                                  BitmapAtlas                                 #
+################################################################################
+
+"""Provide bitmap atlas (.bmp + .json index) packing and sprites extraction tools"""
+
+################################################################################
+#                                    IMPORTS                                   #
+################################################################################
+
+import json
+from math import ceil, sqrt
+from os.path import abspath, splitext, basename
+
+from modules.bitmapfile import Bmpfile
+
+
+################################################################################
+#                                   FUNCTIONS                                  #
+################################################################################
+
+def index_path(spath):
+    """Return atlas index file path (.json) of atlas bitmap file path (.bmp)"""
+    # ------------------------------
+    name, _ext = splitext(spath)
+    return name + ".json"
+
+
+################################################################################
+
+def skyline_pack(sizes, width):
+    """Return rectangles positions list [(x, y), ...] of (sizes) [(w, h), ...] in an area of (width) or [] if a size doesn't fit
+       Skyline bottom-left packing, (y) is the top of the rectangle (y = 0 is the top of the area)"""
+    # ------------------------------
+    skyline = [(0, 0, width)]  # Segments (x, y, w)
+    positions = [None] * len(sizes)
+
+    # Highest rectangles first
+    for n in sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0])):
+        w, h = sizes[n]
+        best = None  # (top, x, segment index)
+
+        for i, (sx, _sy, _sw) in enumerate(skyline):
+            if sx + w > width:
+                break
+
+            # Rectangle top when resting on segments from (i)
+            top, span, j = 0, 0, i
+            while span < w:
+                top = max(top, skyline[j][1])
+                span += skyline[j][2]
+                j += 1
+
+            if best is None or (top + h, sx) < (best[0] + h, best[1]):
+                best = (top, sx, i)
+
+        if best is None:
+            # Wider than area
+            return []
+
+        top, x, i = best
+        positions[n] = (x, top)
+
+        # Skyline update (Covered segments replaced)
+        newseg = [(x, top + h, w)]
+        end = x + w
+        j = i
+        while j < len(skyline) and skyline[j][0] < end:
+            sx, sy, sw = skyline[j]
+            if sx + sw > end:
+                # Partially covered segment (Right part kept)
+                newseg += [(end, sy, sx + sw - end)]
+            j += 1
+        skyline[i:j] = newseg
+
+        # Same level neighbour segments merging
+        k = 1
+        while k < len(skyline):
+            if skyline[k - 1][1] == skyline[k][1]:
+                skyline[k - 1:k + 1] = [(skyline[k - 1][0], skyline[k][1], skyline[k - 1][2] + skyline[k][2])]
+            else:
+                k += 1
+
+    return positions
+
+
+################################################################################
+
+def blit(dst, src, x, y):
+    """Copy bitmap (src) lines into bitmap (dst) at pixel (x, y), (x * bpp) must be a multiple of 8
+       (src) and (dst) must have the same color depth and (src) must be inside (dst) GFX area"""
+    # ------------------------------
+    byte_idx = (x * dst.bitppxl) // 8
+
+    for yy in range(src.bmphght):
+        src_idx = (src.bmpymax - yy) * src.bytplne
+        dst_idx = (dst.bmpymax - (y + yy)) * dst.bytplne + byte_idx
+        dst.bmp[dst_idx:dst_idx + src.bytplnu] = bytes(src.bmp[src_idx:src_idx + src.bytplnu])
+
+    dst.set_dirty(dst.bmpymax - (y + src.bmphght - 1), dst.bmpymax - y)
+
+
+################################################################################
+
+def pack(atlas, pics, spath, replace, maxwidth=4096):
+    """Pack bitmaps (pics) {name: Bmpfile, ...} of same color depth (and palette) into bitmap (atlas), save it to file (.bmp)
+       and write its sprites rectangles index (.json), returns 'True' if success"""
+    # ------------------------------
+    atlas.clean()
+
+    if not pics:
+        atlas.err += [("No bitmap to pack", "Pack")]
+        return False
+
+    names = list(pics)
+    first = pics[names[0]]
+    bpp = first.bitppxl
+
+    for name in names:
+        if pics[name].bitppxl != bpp or pics[name].pal != first.pal:
+            atlas.err += [(f"Bitmap '{name}' color depth or palette differs", "Pack")]
+            return False
+
+    # Sprites widths aligned on bytes (Lines copied as bytes slices)
+    align = 8 // bpp if bpp < 8 else 1
+    sizes = [(ceil(pics[name].bmpwdth / align) * align, pics[name].bmphght) for name in names]
+
+    area = sum(w * h for w, h in sizes)
+    width = max(max(w for w, _h in sizes), ceil(sqrt(area) / align) * align)
+    width = min(width, maxwidth)
+
+    positions = skyline_pack(sizes, width)
+    if not positions:
+        atlas.err += [("A bitmap is wider than atlas", "Pack")]
+        return False
+
+    height = max(y + h for (_x, y), (_w, h) in zip(positions, sizes))
+
+    if not atlas.create(width, height, bpp):
+        return False
+
+    atlas.pal = list(first.pal)
+    for name, (x, y) in zip(names, positions):
+        blit(atlas, pics[name], x, y)
+
+    success = atlas.saveas(spath, replace)
+
+    if success:
+        # Index writing
+        index = {
+            'Image': basename(atlas.flepath),
+            'BitsPerPixel': bpp,
+            'Sprites': {name: [x, y, pics[name].bmpwdth, pics[name].bmphght] for name, (x, y) in zip(names, positions)}
+            }
+
+        try:
+            with open(index_path(atlas.flepath), "w") as f:
+                json.dump(index, f, indent=1)
+                # File is automatically close (End With)
+
+        except OSError as e:
+            atlas.err += [(e.strerror, "Pack")]
+            success = False
+
+    return success
+
+
+################################################################################
+#                                     CLASS                                    #
+################################################################################
+
+class AtlasReader:
+    """<class 'AtlasReader'> to extract sprites from an atlas bitmap file (.bmp) without loading its whole bitmap data"""
+    # ******************************************************
+
+    def __init__(self):
+        """Construct an atlas reader structure"""
+        # ------------------------------
+        self.atlas = Bmpfile()             # Atlas (Header and palette only)
+        self.sprites = {}                  # Sprites rectangles {name: [x, y, w, h], ...}
+        self.err = []                      # ErrorList
+        # ------------------------------
+
+    def open(self, spath):
+        """Load atlas bitmap file header, palette and index (.json)"""
+        # ------------------------------
+        success = False
+
+        self.__init__()
+        pic = self.atlas
+        pic.flepath = abspath(spath)
+
+        if pic.is_openable() and pic.load_hdr() and pic.check_hdr():
+            pic.calculate()
+
+            if pic.checksize() and (pic.palccnt == 0 or pic.load_pal()):
+                # Index loading
+                try:
+                    with open(index_path(pic.flepath), "r") as f:
+                        index = json.load(f)
+                        # File is automatically close (End With)
+
+                except (OSError, ValueError) as e:
+                    self.err += [(str(e), "Open Atlas")]
+
+                else:
+                    self.sprites = index.get('Sprites', {})
+                    success = True
+
+        self.err += pic.err
+
+        return success
+        # ------------------------------
+
+    def names(self):
+        """Return sprites names list"""
+        # ------------------------------
+        return list(self.sprites)
+        # ------------------------------
+
+    def lines(self, name):
+        """Return sprite (name) lines list (memoryview) of atlas lines bytes, bottom line first, or [] if error
+           For 1, 4 bpp: last line byte may contain unused bits"""
+        # ------------------------------
+        if name not in self.sprites:
+            self.err += [(f"Unknown sprite '{name}'", "Sprite Lines")]
+            return []
+
+        pic = self.atlas
+        x, y, w, h = self.sprites[name]
+        first = pic.bmpymax - (y + h - 1)  # Bottom line of sprite (As stored in file)
+        byte_idx = (x * pic.bitppxl) // 8
+        bytplnu = ceil((w * pic.bitppxl) / 8)
+
+        try:
+            with open(pic.flepath, "rb") as f:
+                f.seek(pic.bmpofst + first * pic.bytplne)
+                block = memoryview(f.read(h * pic.bytplne))
+                # File is automatically close (End With)
+
+        except OSError as e:
+            self.err += [(e.strerror, "Sprite Lines")]
+            return []
+
+        return [block[n * pic.bytplne + byte_idx:n * pic.bytplne + byte_idx + bytplnu] for n in range(h)]
+        # ------------------------------
+
+    def crop(self, name):
+        """Return sprite (name) bitmap (Bmpfile) or (None) if error"""
+        # ------------------------------
+        lines = self.lines(name)
+        if not lines:
+            return None
+
+        _x, _y, w, h = self.sprites[name]
+        pic = Bmpfile()
+        pic.create(w, h, self.atlas.bitppxl)
+        pic.pal = list(self.atlas.pal)
+
+        for n, line in enumerate(lines):
+            start_idx = n * pic.bytplne
+            pic.bmp[start_idx:start_idx + pic.bytplnu] = line
+
+        return pic
+        # ------------------------------
+
+    def err_lst(self):
+        """Return current errors list"""
+        # ------------------------------
+        return self.err
+        # ------------------------------
+
+
+################################################################################
+#                                      EOF                                     #
+################################################################################
@@ -9,8 +9,20 @@
 #                                    IMPORTS                                   #
 ################################################################################
 
+from collections import Counter
 from math import ceil, floor
+from multiprocessing import shared_memory
 from os.path import abspath, isfile, basename, splitext, getsize, isdir, dirname
+from zlib import compressobj, crc32
+
+
+################################################################################
+#                                   CONSTANTS                                  #
+################################################################################
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_IDATSIZE = 65536                                                 # IDAT chunk max size
+ABS_TAB = bytes(min(v, 256 - v) for v in range(256))                 # Signed byte absolute value
 
 
 ################################################################################
@@ -31,6 +43,96 @@ def bytlst_to_int(bytlst):
     return int.from_bytes(bytes(bytlst), byteorder='little')
 
 
+################################################################################
+
+def bytes_diffrange(byts1, byts2):
+    """Return first and last differing byte index (tuple) of two same length bytes or (-1, -1) if they're equal"""
+    # ------------------------------
+    if byts1 == byts2:
+        return -1, -1
+
+    # First differing byte (Prefix binary search)
+    lo, hi = 0, len(byts1) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if byts1[:mid + 1] == byts2[:mid + 1]:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    first = lo
+
+    # Last differing byte (Suffix binary search)
+    lo, hi = first, len(byts1) - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if byts1[mid:] == byts2[mid:]:
+            hi = mid - 1
+        else:
+            lo = mid
+
+    return first, lo
+
+
+################################################################################
+
+def label_root(parent, lbl):
+    """Return root label (int) of label (lbl) in union-find labels list (parent), compressing the path"""
+    # ------------------------------
+    while parent[lbl] != lbl:
+        parent[lbl] = parent[parent[lbl]]
+        lbl = parent[lbl]
+
+    return lbl
+
+
+################################################################################
+
+def bytes_sub(byts1, byts2):
+    """Return bytewise difference (bytes) modulo 256 of two same length bytes (no borrow between bytes)"""
+    # ------------------------------
+    bytlen = len(byts1)
+    hmsk = int.from_bytes(b'\x80' * bytlen, byteorder='big')
+    x = int.from_bytes(byts1, byteorder='big')
+    y = int.from_bytes(byts2, byteorder='big')
+
+    return (((x | hmsk) - (y & ~hmsk)) ^ ((x ^ y ^ hmsk) & hmsk)).to_bytes(bytlen, byteorder='big')
+
+
+################################################################################
+
+def bytes_avg(byts1, byts2):
+    """Return bytewise floor average (bytes) of two same length bytes (no carry between bytes)"""
+    # ------------------------------
+    bytlen = len(byts1)
+    lmsk = int.from_bytes(b'\xFE' * bytlen, byteorder='big')
+    x = int.from_bytes(byts1, byteorder='big')
+    y = int.from_bytes(byts2, byteorder='big')
+
+    return ((x & y) + (((x ^ y) & lmsk) >> 1)).to_bytes(bytlen, byteorder='big')
+
+
+################################################################################
+
+def png_chunk(ctype, data):
+    """Return PNG chunk (bytes) of type (ctype) with its length and CRC"""
+    # ------------------------------
+    return len(data).to_bytes(4, byteorder='big') + ctype + data + crc32(ctype + data).to_bytes(4, byteorder='big')
+
+
+################################################################################
+
+def png_filter(line, prior, bytppxl):
+    """Return PNG filtered line (bytes, filter type first), the smallest absolute sum of None, Sub, Up, Average filters"""
+    # ------------------------------
+    left = bytes(bytppxl) + line[:-bytppxl]
+    cands = [line, bytes_sub(line, left), bytes_sub(line, prior), bytes_sub(line, bytes_avg(left, prior))]
+    scores = [sum(cand.translate(ABS_TAB)) for cand in cands]
+    ftype = scores.index(min(scores))
+
+    return bytes([ftype]) + cands[ftype]
+
+
 ################################################################################
 #                                     CLASS                                    #
 ################################################################################
@@ -78,6 +180,15 @@ class Bmpfile:
         self.palofst = 54                  # PaletteOffset      DW  {Cal}
         self.palsize = 0                   # PaletteSize        DW  {Cal}
 
+        # Bitmap Changes Tracking
+        self.bmpdrty = set()               # DirtyLines         DWA {Cal}
+        self.paldrty = False               # DirtyPalette       B   {Cal}
+
+        # Bitmap Shared Memory
+        self.shm = None                    # SharedMemory       SM  {Use}
+        self.shmownr = False               # SharedOwner        B   {Cal}
+        self.shmview = None                # SharedDataView     BA  {Cal}
+
         # Bitmap Error Management
         self.err = []                      # ErrorList          SA  {Use}
         # ------------------------------
@@ -85,6 +196,10 @@ class Bmpfile:
     def clean(self):
         """Set bitmap file structure with initial values (w1 h1 @24bpp)"""
         # ------------------------------
+        if self.shm is not None:
+            # Shared memory block closing (Destroyed if owned)
+            self.detach()
+
         self.__init__()
         # ------------------------------
 
@@ -160,6 +275,7 @@ class Bmpfile:
         """Set bitmap data property from bitmap data list format"""
         # ------------------------------
         self.bmp = bmplst
+        self.set_dirty(0, self.bmphght - 1)
         # ------------------------------
 
     def info_dict(self):
@@ -255,6 +371,7 @@ class Bmpfile:
         # ------------------------------
         if 0 <= index < len(self.pal):
             self.pal[index] = 0xFFFFFF & color  # Mask Alpha channel (Delete)
+            self.paldrty = True
         # ------------------------------
 
     def pal_stdinit(self):
@@ -330,6 +447,37 @@ class Bmpfile:
             bytfull = bitused // 8  # Fully Used Bytes (bytfull + 1 = self.bytplnu)
             lastbyt = 256 - (2 ** (8 - rmngbit))  # Contains Remaining Bits
             self.bmp = (([255] * bytfull) + [lastbyt] + ([0] * self.bytplna)) * self.bmphght
+
+        self.set_dirty(0, self.bmphght - 1)
+        # ------------------------------
+
+    def set_dirty(self, first, last):
+        """Mark bitmap data lines (first) to (last) as modified (line 0 is the bottom line, as stored in file)"""
+        # ------------------------------
+        self.bmpdrty.update(range(max(first, 0), min(last, self.bmphght - 1) + 1))
+        # ------------------------------
+
+    def clear_dirty(self):
+        """Mark bitmap data and palette as unmodified"""
+        # ------------------------------
+        self.bmpdrty = set()
+        self.paldrty = False
+        # ------------------------------
+
+    def dirty_spans(self):
+        """Return sorted list of modified bitmap data lines spans [(first, last), ...]"""
+        # ------------------------------
+        spans = []
+        for line in sorted(self.bmpdrty):
+            if spans and spans[-1][1] == line - 1:
+                # Contiguous line (Extend span)
+                spans[-1] = (spans[-1][0], line)
+
+            else:
+                # New span
+                spans += [(line, line)]
+
+        return spans
         # ------------------------------
 
     def check_hdr(self):
@@ -457,12 +605,13 @@ class Bmpfile:
         return success
         # ------------------------------
 
-    def is_savable(self, replace):
-        """Check parent folder path and if existing file can be replaced"""
+    def is_savable(self, replace, spath=""):
+        """Check parent folder path and if existing file can be replaced (file path (spath) or bitmap file path)"""
         # ------------------------------
         success = False
+        flepath = spath if spath else self.flepath
 
-        if isfile(self.flepath):
+        if isfile(flepath):
             # File already exists
             if not replace:
                 # File can't be replaced
@@ -474,13 +623,13 @@ class Bmpfile:
 
         else:
             # File doesn't exists
-            if isdir(self.flepath):
+            if isdir(flepath):
                 # It's a folder
                 self.err += [("A folder with this name already exists", "Is Savable")]
 
             else:
                 # Check parent folder
-                parentfld = dirname(self.flepath)
+                parentfld = dirname(flepath)
                 if not isdir(parentfld):
                     # Parent folder doesn't exists
                     self.err += [("Parent folder doesn't exists", "Is Savable")]
@@ -570,7 +719,7 @@ class Bmpfile:
     def save(self):
         """Save bitmap file structure to file"""
         # ------------------------------
-        tmparr = bytes(self.hdr_lst() + self.pal_lst() + self.bmp_lst())
+        tmparr = self.tobytes()
 
         try:
             with open(self.flepath, "wb") as f:
@@ -582,11 +731,55 @@ class Bmpfile:
             success = False
 
         else:
+            self.clear_dirty()
             success = True
 
         return success
         # ------------------------------
 
+    def save_incremental(self):
+        """Save modified bitmap data lines (and palette if modified) into existing file (.bmp)
+           The file header layout parameters (size, color depth, ...) must match the bitmap ones, otherwise nothing is written"""
+        # ------------------------------
+        success = False
+
+        try:
+            with open(self.flepath, "r+b") as f:
+                f.seek(0)
+                diskhdr = Bmpfile()
+                diskhdr.set_hdr(list(f.read(54)))
+
+                # Layout parameters only (Calculated sizes and offsets may differ from stored ones)
+                layout = ('bmpwdth', 'bmphght', 'bitppxl', 'comprss', 'hdrsize', 'plnecnt')
+                if any(getattr(diskhdr, prm) != getattr(self, prm) for prm in layout):
+                    # Header on disk doesn't match (Structure changed)
+                    self.err += [("File header layout doesn't match bitmap layout", "Save Incremental")]
+
+                else:
+                    if self.paldrty and self.palccnt > 0:
+                        # Palette writing
+                        f.seek(self.palofst)
+                        f.write(bytes(self.pal_lst()))
+
+                    for first, last in self.dirty_spans():
+                        # Modified lines span writing
+                        start_idx = first * self.bytplne
+                        end_idx = (last + 1) * self.bytplne
+                        f.seek(self.bmpofst + start_idx)
+                        f.write(bytes(self.bmp[start_idx:end_idx]))
+
+                    success = True
+                # File is automatically close (End With)
+
+        except OSError as e:
+            self.err += [(e.strerror, "Save Incremental")]
+
+        if success:
+            self.clear_dirty()
+
+        return success
+        # ------------------------------
+
     def err_lst(self):
         """Return current errors list"""
         # ------------------------------
@@ -681,6 +874,7 @@ class Bmpfile:
 
         if self.bmpxmin <= x <= self.bmpxmax and self.bmpymin <= y <= self.bmpymax:
             # Pixel (x, y) is in GFX area
+            self.bmpdrty.add(self.bmpymax - y)
 
             if self.bitppxl == 1:
                 # 1 Bpp ----------------
@@ -716,13 +910,593 @@ class Bmpfile:
                 byte_idx = x * 3
                 start_idx = byte_idx + ((self.bmpymax - y) * self.bytplne)
 
-                self.bmp[start_idx:start_idx + 3] = int_to_bytlst(c & 0xFFFFFF, 3)
+                self.bmp[start_idx:start_idx + 3] = bytes(int_to_bytlst(c & 0xFFFFFF, 3))
 
             else:
                 # Unexpected Bpp -------
                 pass
         # ------------------------------
 
+    def drawhline(self, x1, x2, y, c):
+        """Sets color (c) of pixels (x1, y) to (x2, y), clipped to GFX area
+           For 1, 4, 8 bpp: (c) is the palette color index
+           For 24 bpp: (c) is the true RGB color (0xRRGGBB)"""
+        # ------------------------------
+        x1 = max(x1, self.bmpxmin)
+        x2 = min(x2, self.bmpxmax)
+
+        if x1 <= x2 and self.bmpymin <= y <= self.bmpymax:
+            # Line is in GFX area
+            start_idx = (self.bmpymax - y) * self.bytplne
+            self.bmpdrty.add(self.bmpymax - y)
+
+            if self.bitppxl == 24:
+                # 24 Bpp ---------------
+                self.bmp[start_idx + x1 * 3:start_idx + (x2 + 1) * 3] = bytes(int_to_bytlst(c & 0xFFFFFF, 3)) * (x2 - x1 + 1)
+
+            else:
+                # 1, 4, 8 Bpp ----------
+                pxlpbyt = 8 // self.bitppxl
+
+                # Edge pixels sharing a byte
+                while x1 <= x2 and x1 % pxlpbyt != 0:
+                    self.drawpixel(x1, y, c)
+                    x1 += 1
+
+                while x1 <= x2 and (x2 + 1) % pxlpbyt != 0:
+                    self.drawpixel(x2, y, c)
+                    x2 -= 1
+
+                if x1 <= x2:
+                    # Fully covered bytes
+                    patbyt = 0
+                    for k in range(pxlpbyt):
+                        patbyt = (patbyt << self.bitppxl) | (c & (self.palccnt - 1))
+
+                    byte_idx = start_idx + (x1 // pxlpbyt)
+                    self.bmp[byte_idx:byte_idx + (x2 - x1 + 1) // pxlpbyt] = bytes([patbyt]) * ((x2 - x1 + 1) // pxlpbyt)
+        # ------------------------------
+
+    def bmp_lines(self):
+        """Return bitmap data lines list (bytes) without added bytes, bottom line first (as stored in file)
+           For 1, 4 bpp: unused bits of the last line byte are cleared"""
+        # ------------------------------
+        lines = [bytes(self.bmp[i:i + self.bytplnu]) for i in range(0, self.bmpsize, self.bytplne)]
+
+        rmngbit = (self.bmpwdth * self.bitppxl) % 8  # Remaining Bits
+        if rmngbit != 0:
+            # Some remaining bits (Mask unused bits)
+            lastmsk = 256 - (2 ** (8 - rmngbit))
+            lines = [line[:-1] + bytes([line[-1] & lastmsk]) for line in lines]
+
+        return lines
+        # ------------------------------
+
+    def histogram(self):
+        """Return bitmap colors histogram
+           For 1, 4, 8 bpp: returns the palette color index counts list
+           For 24 bpp: returns the 256 values counts list of each channel [red, green, blue]"""
+        # ------------------------------
+        if self.bitppxl == 24:
+            # 24 Bpp ---------------
+            data = b"".join(self.bmp_lines())
+
+            hist = []
+            for chnl in (2, 1, 0):  # Bytes order is blue, green, red
+                cnt = Counter(data[chnl::3])
+                hist += [[cnt[v] for v in range(256)]]
+
+        else:
+            # 1, 4, 8 Bpp ----------
+            pxlpbyt = 8 // self.bitppxl                             # Pixels per byte
+            pxlmsk = self.palccnt - 1                               # Pixel mask
+            shifts = [8 - self.bitppxl * (k + 1) for k in range(pxlpbyt)]
+            bytfull = (self.bmpwdth * self.bitppxl) // 8            # Fully Used Bytes
+            rmngpxl = self.bmpwdth - (bytfull * pxlpbyt)            # Pixels in last byte
+
+            hist = [0] * self.palccnt
+
+            # Fully used bytes
+            fullcnt = Counter(b"".join(bytes(self.bmp[i:i + bytfull]) for i in range(0, self.bmpsize, self.bytplne)))
+            for byt, n in fullcnt.items():
+                for shft in shifts:
+                    hist[pxlmsk & (byt >> shft)] += n
+
+            # Last byte of each line (Partially used)
+            if rmngpxl > 0:
+                rmngcnt = Counter(bytes(self.bmp[bytfull::self.bytplne]))
+                for byt, n in rmngcnt.items():
+                    for shft in shifts[:rmngpxl]:
+                        hist[pxlmsk & (byt >> shft)] += n
+
+        return hist
+        # ------------------------------
+
+    def stats(self):
+        """Return bitmap statistics dictionary (min, max, mean of each channel and unique colors count)"""
+        # ------------------------------
+        hist = self.histogram()
+
+        if self.bitppxl == 24:
+            # 24 Bpp ---------------
+            chnlhist = hist
+
+            # Unique colors (Pixels widened to 4 bytes integers)
+            data = b"".join(self.bmp_lines())
+            quad = bytearray((len(data) // 3) * 4)
+            for chnl in range(3):
+                quad[chnl::4] = data[chnl::3]
+            colrcnt = len(set(memoryview(quad).cast("I")))
+
+        else:
+            # 1, 4, 8 Bpp ----------
+            chnlhist = [[0] * 256, [0] * 256, [0] * 256]
+            colors = set()
+            for idx, n in enumerate(hist):
+                if n > 0:
+                    color = self.pal[idx]
+                    colors.add(color)
+                    chnlhist[0][0xFF & (color >> 16)] += n
+                    chnlhist[1][0xFF & (color >> 8)] += n
+                    chnlhist[2][0xFF & color] += n
+            colrcnt = len(colors)
+
+        pxlcnt = self.bmpwdth * self.bmphght
+        statsdict = {}
+        for name, chist in zip(("Red", "Green", "Blue"), chnlhist):
+            used = [v for v in range(256) if chist[v] > 0]
+            statsdict[name + "Min"] = used[0]
+            statsdict[name + "Max"] = used[-1]
+            statsdict[name + "Mean"] = sum(v * chist[v] for v in used) / pxlcnt
+        statsdict['ColorsCount'] = colrcnt
+
+        return statsdict
+        # ------------------------------
+
+    def bbox(self, exclude):
+        """Return bounding box (xmin, ymin, xmax, ymax) of pixels which color isn't (exclude), or () if there is none
+           For 1, 4, 8 bpp: (exclude) is the palette color index
+           For 24 bpp: (exclude) is the true RGB color (0xRRGGBB)"""
+        # ------------------------------
+        if self.bitppxl == 24:
+            # 24 Bpp ---------------
+            bgline = bytes(int_to_bytlst(exclude & 0xFFFFFF, 3)) * self.bmpwdth
+
+        else:
+            # 1, 4, 8 Bpp ----------
+            pxlpbyt = 8 // self.bitppxl
+            pxlmsk = self.palccnt - 1
+            shifts = [8 - self.bitppxl * (k + 1) for k in range(pxlpbyt)]
+
+            bgbyt = 0
+            for shft in shifts:
+                bgbyt |= (exclude & pxlmsk) << shft
+            bgline = bytes([bgbyt]) * self.bytplnu
+
+            rmngbit = (self.bmpwdth * self.bitppxl) % 8  # Remaining Bits
+            if rmngbit != 0:
+                # Some remaining bits (Mask unused bits, as bmp_lines does)
+                lastmsk = 256 - (2 ** (8 - rmngbit))
+                bgline = bgline[:-1] + bytes([bgline[-1] & lastmsk])
+
+        xmin, ymin, xmax, ymax = self.bmpwdth, self.bmphght, -1, -1
+
+        for n, line in enumerate(self.bmp_lines()):
+            first, last = bytes_diffrange(line, bgline)
+            if first < 0:
+                # Background line
+                continue
+
+            y = self.bmpymax - n
+            ymin = min(ymin, y)
+            ymax = max(ymax, y)
+
+            if self.bitppxl == 24:
+                xfirst, xlast = first // 3, last // 3
+
+            else:
+                # Locate differing pixels in first and last differing bytes
+                diffbyt = line[first] ^ bgline[first]
+                xfirst = first * pxlpbyt + min(k for k, s in enumerate(shifts) if pxlmsk & (diffbyt >> s))
+                diffbyt = line[last] ^ bgline[last]
+                xlast = last * pxlpbyt + max(k for k, s in enumerate(shifts) if pxlmsk & (diffbyt >> s))
+
+            xmin = min(xmin, xfirst)
+            xmax = max(xmax, xlast)
+
+        if ymax < 0:
+            # Only (exclude) color
+            return ()
+
+        return xmin, ymin, xmax, ymax
+        # ------------------------------
+
+    def apply_lut(self, table):
+        """Apply a lookup table to each bitmap data line (added bytes unchanged), returns 'True' if success
+           For 1, 4, 8 bpp: (table) maps each palette color index to a new palette color index (2, 16, 256 values)
+           For 24 bpp: (table) maps each channel value (256 values) or is a list of 3 tables [red, green, blue]"""
+        # ------------------------------
+        if self.bitppxl == 24:
+            # 24 Bpp ---------------
+            tables = table if len(table) == 3 else [table] * 3
+            if any(len(t) != 256 for t in tables):
+                self.err += [("Lookup table must contain 256 values", "Apply Lut")]
+                return False
+
+            bgrtabs = [bytes(t) for t in reversed(tables)]  # Bytes order is blue, green, red
+
+            for start_idx in range(0, self.bmpsize, self.bytplne):
+                line = bytes(self.bmp[start_idx:start_idx + self.bytplnu])
+
+                if bgrtabs[0] == bgrtabs[1] == bgrtabs[2]:
+                    # Same table for all channels
+                    line = line.translate(bgrtabs[0])
+
+                else:
+                    # Table per channel
+                    chnls = bytearray(len(line))
+                    for chnl in range(3):
+                        chnls[chnl::3] = line[chnl::3].translate(bgrtabs[chnl])
+                    line = chnls
+
+                self.bmp[start_idx:start_idx + self.bytplnu] = line
+
+        else:
+            # 1, 4, 8 Bpp ----------
+            if len(table) != self.palccnt:
+                self.err += [(f"Lookup table must contain {self.palccnt} values", "Apply Lut")]
+                return False
+
+            pxlpbyt = 8 // self.bitppxl                             # Pixels per byte
+            pxlmsk = self.palccnt - 1                               # Pixel mask
+            shifts = [8 - self.bitppxl * (k + 1) for k in range(pxlpbyt)]
+            bytfull = (self.bmpwdth * self.bitppxl) // 8            # Fully Used Bytes
+            rmngpxl = self.bmpwdth - (bytfull * pxlpbyt)            # Pixels in last byte
+
+            # Packed pixels byte table
+            fulltab = bytes(sum((pxlmsk & table[pxlmsk & (byt >> s)]) << s for s in shifts) for byt in range(256))
+
+            for start_idx in range(0, self.bmpsize, self.bytplne):
+                line = bytes(self.bmp[start_idx:start_idx + bytfull])
+                self.bmp[start_idx:start_idx + bytfull] = line.translate(fulltab)
+
+            if rmngpxl > 0:
+                # Last byte of each line (Unused bits unchanged)
+                unusedmsk = (1 << shifts[rmngpxl - 1]) - 1
+                lasttab = bytes((byt & unusedmsk) | sum((pxlmsk & table[pxlmsk & (byt >> s)]) << s for s in shifts[:rmngpxl])
+                                for byt in range(256))
+                self.bmp[bytfull::self.bytplne] = bytes(self.bmp[bytfull::self.bytplne]).translate(lasttab)
+
+        self.set_dirty(0, self.bmphght - 1)
+
+        return True
+        # ------------------------------
+
+    def remap_palette(self, mapping):
+        """Replace pixels palette color indexes according to (mapping) {old_index: new_index, ...}, returns 'True' if success
+           For 1, 4, 8 bpp only"""
+        # ------------------------------
+        if self.bitppxl == 24:
+            self.err += [("Color depth must be 1, 4, or 8 bpp", "Remap Palette")]
+            return False
+
+        table = list(range(self.palccnt))
+        for old, new in mapping.items():
+            if 0 <= old < self.palccnt and 0 <= new < self.palccnt:
+                table[old] = new
+
+        return self.apply_lut(table)
+        # ------------------------------
+
+    def compact_palette(self):
+        """Move used palette colors first (duplicates merged), renumber pixels palette color indexes
+           Unused palette colors are set to black (0x000000), returns used colors count or (-1) if error
+           For 1, 4, 8 bpp only"""
+        # ------------------------------
+        if self.bitppxl == 24:
+            self.err += [("Color depth must be 1, 4, or 8 bpp", "Compact Palette")]
+            return -1
+
+        newpal = []
+        table = [0] * self.palccnt
+        for idx, n in enumerate(self.histogram()):
+            if n > 0:
+                # Used palette color
+                color = self.pal[idx]
+                if color not in newpal:
+                    newpal += [color]
+                table[idx] = newpal.index(color)
+
+        self.apply_lut(table)
+        self.pal = newpal + [0x000000] * (self.palccnt - len(newpal))
+        self.paldrty = True
+
+        return len(newpal)
+        # ------------------------------
+
+    def used_bits(self):
+        """Return used bits mask of one bitmap data line (bytes, bytes per line used length) and of the whole bitmap data (int)
+           Unused bits of the last line byte and added bytes are cleared"""
+        # ------------------------------
+        bitused = self.bmpwdth * self.bitppxl
+        rmngbit = bitused % 8  # Remaining Bits
+
+        linemsk = b'\xFF' * (bitused // 8)
+        if rmngbit != 0:
+            # Some remaining bits
+            linemsk += bytes([256 - (2 ** (8 - rmngbit))])
+
+        bmpmsk = int.from_bytes((linemsk + bytes(self.bytplna)) * self.bmphght, byteorder='big')
+
+        return linemsk, bmpmsk
+        # ------------------------------
+
+    def mask_op(self, other, op):
+        """Apply bitwise operation (op) 'and', 'or', 'xor' with same size 1 bpp bitmap (other), or 'not', returns 'True' if success
+           Whole bitmap data is processed as a single integer, added bytes and unused bits are unchanged"""
+        # ------------------------------
+        if self.bitppxl != 1:
+            self.err += [("Color depth must be 1 bpp", "Mask Operation")]
+            return False
+
+        if op != 'not' and (other.bitppxl != 1 or other.bmpwdth != self.bmpwdth or other.bmphght != self.bmphght):
+            self.err += [("Bitmaps must be 1 bpp with same width and height", "Mask Operation")]
+            return False
+
+        _linemsk, bmpmsk = self.used_bits()
+        x = int.from_bytes(bytes(self.bmp), byteorder='big')
+
+        if op == 'not':
+            result = x ^ bmpmsk
+
+        else:
+            y = int.from_bytes(bytes(other.bmp), byteorder='big')
+
+            if op == 'and':
+                result = x & y
+            elif op == 'or':
+                result = x | y
+            elif op == 'xor':
+                result = x ^ y
+            else:
+                self.err += [(f"Unknown operation '{op}'", "Mask Operation")]
+                return False
+
+            result = (result & bmpmsk) | (x & ~bmpmsk)
+
+        self.bmp[0:self.bmpsize] = result.to_bytes(self.bmpsize, byteorder='big')
+        self.set_dirty(0, self.bmphght - 1)
+
+        return True
+        # ------------------------------
+
+    def mask_and(self, other):
+        """Bitwise AND with same size 1 bpp bitmap (other), returns 'True' if success"""
+        # ------------------------------
+        return self.mask_op(other, 'and')
+        # ------------------------------
+
+    def mask_or(self, other):
+        """Bitwise OR with same size 1 bpp bitmap (other), returns 'True' if success"""
+        # ------------------------------
+        return self.mask_op(other, 'or')
+        # ------------------------------
+
+    def mask_xor(self, other):
+        """Bitwise XOR with same size 1 bpp bitmap (other), returns 'True' if success"""
+        # ------------------------------
+        return self.mask_op(other, 'xor')
+        # ------------------------------
+
+    def mask_not(self):
+        """Bitwise NOT of 1 bpp bitmap, returns 'True' if success"""
+        # ------------------------------
+        return self.mask_op(None, 'not')
+        # ------------------------------
+
+    def popcount(self):
+        """Return count of 1 bpp bitmap pixels set (palette color index 1) or (-1) if error"""
+        # ------------------------------
+        if self.bitppxl != 1:
+            self.err += [("Color depth must be 1 bpp", "Popcount")]
+            return -1
+
+        _linemsk, bmpmsk = self.used_bits()
+
+        return bin(int.from_bytes(bytes(self.bmp), byteorder='big') & bmpmsk).count("1")
+        # ------------------------------
+
+    def shift(self, dx, dy, fill=0):
+        """Move 1 bpp bitmap pixels by (dx) to the right and (dy) to the bottom (negative values: left and top)
+           Vacated pixels are set to (fill) palette color index, returns 'True' if success"""
+        # ------------------------------
+        if self.bitppxl != 1:
+            self.err += [("Color depth must be 1 bpp", "Shift")]
+            return False
+
+        linemsk, _bmpmsk = self.used_bits()
+        linemsk = int.from_bytes(linemsk, byteorder='big')
+
+        # Vacated columns (Pixel 0 is the most significant bit)
+        if dx >= 0:
+            vacated = linemsk & ~(linemsk >> dx)
+        else:
+            vacated = linemsk & ~(linemsk << -dx)
+        vacated = vacated if fill & 0x01 else 0
+        emptyline = (linemsk if fill & 0x01 else 0).to_bytes(self.bytplnu, byteorder='big')
+
+        lines = self.bmp_lines()
+
+        for n in range(self.bmphght):
+            src = n + dy  # Source line (Bottom line first)
+
+            if 0 <= src < self.bmphght:
+                v = int.from_bytes(lines[src], byteorder='big')
+                v = (v >> dx) if dx >= 0 else (v << -dx)
+                line = ((v & linemsk) | vacated).to_bytes(self.bytplnu, byteorder='big')
+
+            else:
+                line = emptyline
+
+            start_idx = n * self.bytplne
+            self.bmp[start_idx:start_idx + self.bytplnu] = line
+
+        self.set_dirty(0, self.bmphght - 1)
+
+        return True
+        # ------------------------------
+
+    def line_mask(self, y, c):
+        """Return pixels mask (bytearray) of line (y), one byte per pixel set to 1 if pixel color is (c), otherwise 0
+           For 1, 4, 8 bpp: (c) is the palette color index
+           For 24 bpp: (c) is the true RGB color (0xRRGGBB)"""
+        # ------------------------------
+        start_idx = (self.bmpymax - y) * self.bytplne
+        line = bytes(self.bmp[start_idx:start_idx + self.bytplnu])
+
+        if self.bitppxl == 24:
+            # 24 Bpp ---------------
+            mask = -1
+            for chnl, shft in ((0, 0), (1, 8), (2, 16)):  # Bytes order is blue, green, red
+                tab = bytearray(256)
+                tab[0xFF & (c >> shft)] = 1
+                mask &= int.from_bytes(line[chnl::3].translate(tab), byteorder='big')
+            mask = bytearray(mask.to_bytes(self.bmpwdth, byteorder='big'))
+
+        elif self.bitppxl == 8:
+            # 8 Bpp ----------------
+            tab = bytearray(256)
+            tab[0xFF & c] = 1
+            mask = bytearray(line.translate(tab))
+
+        else:
+            # 1, 4 Bpp -------------
+            pxlpbyt = 8 // self.bitppxl
+            pxlmsk = self.palccnt - 1
+            shifts = [8 - self.bitppxl * (k + 1) for k in range(pxlpbyt)]
+            tab = [bytes(int(pxlmsk & (byt >> s) == c & pxlmsk) for s in shifts) for byt in range(256)]
+            mask = bytearray(b"".join(map(tab.__getitem__, line))[:self.bmpwdth])
+
+        return mask
+        # ------------------------------
+
+    def flood_fill(self, x, y, c, connectivity=4):
+        """Sets color (c) of the area of same color pixels containing pixel (x, y), returns filled pixels count
+           Area pixels are linked by sides (connectivity 4) or by sides and corners (connectivity 8)
+           For 1, 4, 8 bpp: (c) is the palette color index
+           For 24 bpp: (c) is the true RGB color (0xRRGGBB)"""
+        # ------------------------------
+        target = self.pixelcolor(x, y, False)
+        if target < 0 or target == c:
+            # Pixel doesn't exists or area already filled
+            return 0
+
+        diag = 1 if connectivity == 8 else 0
+        masks = {}  # Unfilled target pixels of visited lines
+        count = 0
+
+        seeds = [(x, y)]
+        while seeds:
+            sx, sy = seeds.pop()
+            if sy not in masks:
+                masks[sy] = self.line_mask(sy, target)
+            mask = masks[sy]
+
+            if not mask[sx]:
+                # Already filled
+                continue
+
+            # Span extension (left and right)
+            xl = mask.rfind(b'\x00', 0, sx) + 1
+            xr = mask.find(b'\x00', sx)
+            xr = (xr if xr >= 0 else self.bmpwdth) - 1
+
+            mask[xl:xr + 1] = bytes(xr - xl + 1)
+            self.drawhline(xl, xr, sy, c)
+            count += xr - xl + 1
+
+            # New seeds from runs of adjacent lines
+            lo = max(xl - diag, 0)
+            hi = min(xr + diag, self.bmpxmax) + 1
+            for ny in (sy - 1, sy + 1):
+                if self.bmpymin <= ny <= self.bmpymax:
+                    if ny not in masks:
+                        masks[ny] = self.line_mask(ny, target)
+                    nmask = masks[ny]
+
+                    i = nmask.find(b'\x01', lo, hi)
+                    while i >= 0:
+                        seeds += [(i, ny)]
+                        j = nmask.find(b'\x00', i, hi)
+                        i = nmask.find(b'\x01', j, hi) if j >= 0 else -1
+
+        return count
+        # ------------------------------
+
+    def label_components(self, c=1, connectivity=8):
+        """Return connected areas list [(xmin, ymin, xmax, ymax, area), ...] of pixels of color (c), top area first
+           Area pixels are linked by sides (connectivity 4) or by sides and corners (connectivity 8)
+           For 1 bpp only"""
+        # ------------------------------
+        if self.bitppxl != 1:
+            self.err += [("Color depth must be 1 bpp", "Label Components")]
+            return []
+
+        diag = 1 if connectivity == 8 else 0
+        parent = []    # Union-find labels
+        runs = []      # Runs (label, xmin, xmax, y)
+        prevruns = []  # Previous line runs (label, xmin, xmax)
+
+        for y in range(self.bmphght):
+            mask = self.line_mask(y, c)
+            lineruns = []
+            p = 0
+
+            i = mask.find(b'\x01')
+            while i >= 0:
+                j = mask.find(b'\x00', i)
+                j = (j if j >= 0 else self.bmpwdth) - 1
+
+                # Link with overlapping previous line runs
+                lbl = -1
+                while p < len(prevruns) and prevruns[p][2] < i - diag:
+                    p += 1
+                q = p
+                while q < len(prevruns) and prevruns[q][1] <= j + diag:
+                    plbl = label_root(parent, prevruns[q][0])
+                    if lbl < 0:
+                        lbl = plbl
+                    elif plbl != lbl:
+                        parent[max(plbl, lbl)] = min(plbl, lbl)
+                        lbl = min(plbl, lbl)
+                    q += 1
+
+                if lbl < 0:
+                    # New label
+                    lbl = len(parent)
+                    parent += [lbl]
+
+                lineruns += [(lbl, i, j)]
+                runs += [(lbl, i, j, y)]
+                i = mask.find(b'\x01', j + 1) if j + 1 < self.bmpwdth else -1
+
+            prevruns = lineruns
+
+        # Areas aggregation
+        areas = {}
+        for lbl, xmin, xmax, y in runs:
+            root = label_root(parent, lbl)
+            if root not in areas:
+                areas[root] = [xmin, y, xmax, y, 0]
+            area = areas[root]
+            area[0] = min(area[0], xmin)
+            area[2] = max(area[2], xmax)
+            area[3] = y
+            area[4] += xmax - xmin + 1
+
+        return [tuple(areas[root]) for root in sorted(areas)]
+        # ------------------------------
+
     def create(self, width, height, bpp):
         """Initialise a new bitmap file structure"""
         # ------------------------------
@@ -769,6 +1543,8 @@ class Bmpfile:
                                 # Palette loading
                                 success = self.load_pal()
 
+                            self.clear_dirty()
+
         return success
         # ------------------------------
 
@@ -787,6 +1563,398 @@ class Bmpfile:
         return success
         # ------------------------------
 
+    def frombytes(self, buf):
+        """Load bitmap file structure from bytes-like object (buf) holding a bitmap file (.bmp) content
+           Bitmap data is a zero-copy view of (buf) if it's writable (bytearray), otherwise a copy"""
+        # ------------------------------
+        success = False
+
+        self.clean()
+        view = memoryview(buf).cast('B')
+        flen = len(view)
+
+        if flen < 58:
+            # Min w1 h1 @24bpp
+            self.err += [(f"Buffer too small, less than 58 bytes ({flen})", "From Bytes")]
+
+        elif flen > 50331702:
+            # Max w4096 h4096 @24bpp
+            self.err += [(f"Buffer too big, more than 50331702 bytes ({flen})", "From Bytes")]
+
+        else:
+            self.set_hdr(list(view[0:54]))
+
+            if self.check_hdr():
+                # Header parameters successfully checked
+                self.calculate()
+
+                if flen < self.flesize:
+                    # Real size < Calculated size
+                    self.err += [("Unexpected buffer size", "From Bytes")]
+
+                else:
+                    bmpview = view[self.bmpofst:self.bmpofst + self.bmpsize]
+                    self.bmp = list(bmpview) if view.readonly else bmpview
+
+                    if self.palccnt > 0:
+                        # Palette loading
+                        self.set_pal(list(view[self.palofst:self.palofst + self.palsize]))
+
+                    success = True
+
+        return success
+        # ------------------------------
+
+    def open_stream(self, fileobj):
+        """Load bitmap file structure from binary file-like object (fileobj) read up to its end
+           Reading loops until end of stream (Raw streams may return less bytes than requested)"""
+        # ------------------------------
+        buf = bytearray()
+
+        try:
+            while len(buf) < 50331703:
+                # Max w4096 h4096 @24bpp (+1 to detect too big)
+                chunk = fileobj.read(50331703 - len(buf))
+                if not chunk:
+                    # End of stream
+                    break
+                buf += chunk
+
+        except OSError as e:
+            self.clean()
+            self.err += [(str(e), "Open Stream")]
+            success = False
+
+        else:
+            success = self.frombytes(buf)
+
+        return success
+        # ------------------------------
+
+    def tobytes(self):
+        """Return bitmap file structure as bitmap file (.bmp) content (bytes)"""
+        # ------------------------------
+        return bytes(self.hdr_lst() + self.pal_lst()) + bytes(self.bmp_lst())
+        # ------------------------------
+
+    def save_stream(self, fileobj):
+        """Write bitmap file structure as bitmap file (.bmp) content to binary file-like object (fileobj)"""
+        # ------------------------------
+        try:
+            fileobj.write(bytes(self.hdr_lst() + self.pal_lst()))
+            fileobj.write(self.bmp if isinstance(self.bmp, memoryview) else bytes(self.bmp))
+
+        except OSError as e:
+            self.err += [(str(e), "Save Stream")]
+            success = False
+
+        else:
+            success = True
+
+        return success
+        # ------------------------------
+
+    def rgb_lines(self, step=1):
+        """Yield bitmap lines true colors (bytes, 3 bytes per pixel, red first), top line first
+           Only one pixel every (step) columns and lines is kept (step 1: all pixels)"""
+        # ------------------------------
+        if self.bitppxl != 24:
+            # Palette color index to channel value tables
+            pal = self.pal + [0] * (self.palccnt - len(self.pal))
+            tabs = [bytes(0xFF & (pal[i & (self.palccnt - 1)] >> shft) for i in range(256)) for shft in (16, 8, 0)]
+
+            if self.bitppxl < 8:
+                # Byte to pixels indexes table
+                pxlmsk = self.palccnt - 1
+                shifts = [8 - self.bitppxl * (k + 1) for k in range(8 // self.bitppxl)]
+                unpack = [bytes(pxlmsk & (byt >> s) for s in shifts) for byt in range(256)]
+
+        wdth = ceil(self.bmpwdth / step)
+
+        for n in range(self.bmpymax, -1, -step):
+            start_idx = n * self.bytplne
+            line = bytes(self.bmp[start_idx:start_idx + self.bytplnu])
+            rgb = bytearray(wdth * 3)
+
+            if self.bitppxl == 24:
+                # 24 Bpp (Bytes order is blue, green, red)
+                rgb[0::3] = line[2::3 * step]
+                rgb[1::3] = line[1::3 * step]
+                rgb[2::3] = line[0::3 * step]
+
+            else:
+                # 1, 4, 8 Bpp
+                if self.bitppxl < 8:
+                    line = b"".join(map(unpack.__getitem__, line))[:self.bmpwdth]
+
+                line = line[::step]
+                for chnl in range(3):
+                    rgb[chnl::3] = line.translate(tabs[chnl])
+
+            yield bytes(rgb)
+        # ------------------------------
+
+    def ppm_data(self, step=1):
+        """Return binary PPM (P6) content (bytes) of bitmap true colors, or PGM (P5) for 8 bpp with grayscale palette
+           Only one pixel every (step) columns and lines is kept (step 1: all pixels)"""
+        # ------------------------------
+        wdth = ceil(self.bmpwdth / step)
+        hght = ceil(self.bmphght / step)
+
+        if self.bitppxl == 8 and self.pal[:256] == [i * 0x010101 for i in range(256)]:
+            # Grayscale (Palette color index is gray level)
+            header = f"P5\n{wdth} {hght}\n255\n".encode('ascii')
+            lines = (bytes(self.bmp[n * self.bytplne:n * self.bytplne + self.bmpwdth])[::step]
+                     for n in range(self.bmpymax, -1, -step))
+
+        else:
+            header = f"P6\n{wdth} {hght}\n255\n".encode('ascii')
+            lines = self.rgb_lines(step)
+
+        return header + b"".join(lines)
+        # ------------------------------
+
+    def to_photoimage(self, step=1, master=None):
+        """Return Tkinter PhotoImage of bitmap, encoded once as PPM/PGM data (one pixel every (step) columns and lines)"""
+        # ------------------------------
+        from tkinter import PhotoImage  # Tkinter is only needed for preview
+
+        return PhotoImage(master=master, data=self.ppm_data(step))
+        # ------------------------------
+
+    def save_png(self, spath, replace, level=6):
+        """Save bitmap to PNG file (.png), lines are streamed through zlib (level 0 to 9), returns 'True' if success
+           For 1, 4, 8 bpp: indexed colors with palette, for 24 bpp: truecolor with adaptive line filters"""
+        # ------------------------------
+        success = False
+        flepath = abspath(spath)
+
+        if self.is_savable(replace, flepath):
+            truecolor = self.bitppxl == 24
+
+            try:
+                with open(flepath, "wb") as f:
+                    f.write(PNG_SIGNATURE)
+
+                    ihdr = self.bmpwdth.to_bytes(4, byteorder='big') + self.bmphght.to_bytes(4, byteorder='big')
+                    ihdr += bytes([8, 2, 0, 0, 0]) if truecolor else bytes([self.bitppxl, 3, 0, 0, 0])
+                    f.write(png_chunk(b'IHDR', ihdr))
+
+                    if not truecolor:
+                        f.write(png_chunk(b'PLTE', b"".join(c.to_bytes(3, byteorder='big') for c in self.pal)))
+
+                    zobj = compressobj(level)
+                    idat = b""
+
+                    if truecolor:
+                        # Adaptive filter per line
+                        prior = bytes(self.bmpwdth * 3)
+                        lines = self.rgb_lines()
+
+                    else:
+                        # Palette lines aren't filtered (Top line first)
+                        lines = (bytes(self.bmp[n * self.bytplne:n * self.bytplne + self.bytplnu])
+                                 for n in range(self.bmphght - 1, -1, -1))
+
+                    for line in lines:
+                        if truecolor:
+                            idat += zobj.compress(png_filter(line, prior, 3))
+                            prior = line
+
+                        else:
+                            idat += zobj.compress(b'\x00' + line)
+
+                        if len(idat) >= PNG_IDATSIZE:
+                            f.write(png_chunk(b'IDAT', idat))
+                            idat = b""
+
+                    idat += zobj.flush()
+                    f.write(png_chunk(b'IDAT', idat))
+                    f.write(png_chunk(b'IEND', b""))
+                    # File is automatically close (End With)
+
+            except OSError as e:
+                self.err += [(e.strerror, "Save Png")]
+
+            else:
+                success = True
+
+        return success
+        # ------------------------------
+
+    def save_ppm(self, spath, replace):
+        """Save bitmap true colors to binary PPM file (.ppm, P6), lines are streamed, returns 'True' if success"""
+        # ------------------------------
+        success = False
+        flepath = abspath(spath)
+
+        if self.is_savable(replace, flepath):
+            try:
+                with open(flepath, "wb") as f:
+                    f.write(f"P6\n{self.bmpwdth} {self.bmphght}\n255\n".encode('ascii'))
+                    for line in self.rgb_lines():
+                        f.write(line)
+                    # File is automatically close (End With)
+
+            except OSError as e:
+                self.err += [(e.strerror, "Save Ppm")]
+
+            else:
+                success = True
+
+        return success
+        # ------------------------------
+
+    def open_ppm(self, spath):
+        """Load bitmap file structure from binary PPM file (.ppm P6 as 24 bpp, .pgm P5 as 8 bpp grayscale)
+           File path is left empty (Not a bitmap file), use saveas() to write it as a bitmap file (.bmp)"""
+        # ------------------------------
+        success = False
+
+        self.clean()
+
+        try:
+            with open(abspath(spath), "rb") as f:
+                # Header (Magic number, width, height, max value), comments skipped
+                tokens = []
+                while len(tokens) < 4:
+                    line = f.readline()
+                    if not line:
+                        break
+                    tokens += line.split(b'#')[0].split()
+
+                if len(tokens) != 4 or tokens[0] not in (b'P6', b'P5') or tokens[3] != b'255':
+                    self.err += [("Unsupported PPM file (P6 or P5 with max value 255 only)", "Open Ppm")]
+
+                elif self.create(int(tokens[1]), int(tokens[2]), 24 if tokens[0] == b'P6' else 8):
+                    # Bitmap lines loading (Top line first)
+                    if self.bitppxl == 8:
+                        self.pal = [i * 0x010101 for i in range(256)]
+
+                    success = True
+                    for n in range(self.bmphght - 1, -1, -1):
+                        line = f.read(self.bytplnu)
+                        if len(line) < self.bytplnu:
+                            self.err += [("Unexpected file size", "Open Ppm")]
+                            success = False
+                            break
+
+                        if self.bitppxl == 24:
+                            # RGB to bitmap bytes order (blue, green, red)
+                            bgr = bytearray(line)
+                            bgr[0::3] = line[2::3]
+                            bgr[2::3] = line[0::3]
+                            line = bgr
+
+                        start_idx = n * self.bytplne
+                        self.bmp[start_idx:start_idx + self.bytplnu] = line
+
+                    self.clear_dirty()
+                # File is automatically close (End With)
+
+        except (OSError, ValueError) as e:
+            self.err += [(str(e), "Open Ppm")]
+            success = False
+
+        return success
+        # ------------------------------
+
+    def to_shared(self):
+        """Move bitmap file structure into a new shared memory block, returns its name or "" if error
+           Bitmap data is then read and written in the block, header and palette are copied once"""
+        # ------------------------------
+        if self.shm is not None:
+            # Already shared
+            return self.shm.name
+
+        tmparr = self.tobytes()
+
+        try:
+            shm = shared_memory.SharedMemory(create=True, size=len(tmparr))
+
+        except OSError as e:
+            self.err += [(e.strerror, "To Shared")]
+            return ""
+
+        shm.buf[:len(tmparr)] = tmparr
+        self.shm = shm
+        self.shmownr = True
+        self.shmview = shm.buf[self.bmpofst:self.bmpofst + self.bmpsize]
+        self.bmp = self.shmview
+
+        return shm.name
+        # ------------------------------
+
+    def attach(self, name):
+        """Load bitmap file structure from shared memory block (name) created by to_shared(), bitmap data isn't copied"""
+        # ------------------------------
+        success = False
+
+        self.clean()
+
+        try:
+            try:
+                shm = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+ (Owner only unlinks)
+
+            except TypeError:
+                shm = shared_memory.SharedMemory(name=name)
+
+        except OSError as e:
+            self.err += [(e.strerror, "Attach")]
+
+        else:
+            self.set_hdr(list(shm.buf[0:54]))
+
+            if self.check_hdr():
+                # Header parameters successfully checked
+                self.calculate()
+                self.set_pal(list(shm.buf[self.palofst:self.palofst + self.palsize]))
+                self.shm = shm
+                self.shmview = shm.buf[self.bmpofst:self.bmpofst + self.bmpsize]
+                self.bmp = self.shmview
+                success = True
+
+            else:
+                shm.close()
+
+        return success
+        # ------------------------------
+
+    def detach(self):
+        """Close shared memory block, if created by to_shared() (owner) bitmap data is copied back (all lines marked as modified)
+           and the block is destroyed, otherwise (attached) bitmap file structure is set with initial values (w1 h1 @24bpp), the block is kept"""
+        # ------------------------------
+        if self.shm is not None:
+            shm = self.shm
+            owner = self.shmownr
+            bmplst = list(self.bmp) if owner else []
+
+            # Own data view released (Bitmap data may have been replaced by set_bmp())
+            self.shmview.release()
+            shm.close()
+
+            if owner:
+                # Owner (Block destroyed, data kept and marked as modified by workers)
+                shm.unlink()
+                self.shm = None
+                self.shmownr = False
+                self.shmview = None
+                self.set_bmp(bmplst)
+
+            else:
+                self.__init__()
+        # ------------------------------
+
+    def line_bands(self, count):
+        """Return lines bands list [(ymin, ymax), ...] splitting bitmap lines in (count) bands (one per worker)
+           Each band covers whole lines (bytes per line), so workers never write the same bitmap data bytes"""
+        # ------------------------------
+        count = max(1, min(count, self.bmphght))
+        bounds = [(self.bmphght * i) // count for i in range(count + 1)]
+
+        return [(bounds[i], bounds[i + 1] - 1) for i in range(count)]
+        # ------------------------------
+
 
 ################################################################################
 #                                      EOF                                     #
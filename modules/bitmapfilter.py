@@ -0,0 +1,261 @@
+
+################################################################################
+#                                 BitmapFilter                                 #
+################################################################################
+
+"""Provide bitmap file (.bmp) convolution filters (blur, sharpen, edge)"""
+
+################################################################################
+#                                    IMPORTS                                   #
+################################################################################
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from sys import byteorder
+
+
+################################################################################
+#                                   CONSTANTS                                  #
+################################################################################
+
+# Separable kernels (horizontal, vertical)
+BLUR_3 = ([1, 2, 1], [1, 2, 1])
+BLUR_5 = ([1, 4, 6, 4, 1], [1, 4, 6, 4, 1])
+
+# General kernels
+SHARPEN_3 = [
+    [0, -1, 0],
+    [-1, 5, -1],
+    [0, -1, 0]
+    ]
+
+EDGE_3 = [
+    [-1, -1, -1],
+    [-1, 8, -1],
+    [-1, -1, -1]
+    ]
+
+LANEBIT = 32  # Bits per sample lane (Big integer lines)
+
+
+################################################################################
+#                                   FUNCTIONS                                  #
+################################################################################
+
+def lanes_int(samples, rad):
+    """Return an integer holding each sample (bytes) in a 32 bits lane, edge samples replicated (rad) times"""
+    # ------------------------------
+    samples = samples[:1] * rad + samples + samples[-1:] * rad
+    quad = bytearray(len(samples) * 4)
+    quad[0::4] = samples
+
+    return int.from_bytes(quad, byteorder='little')
+
+
+################################################################################
+
+def lanes_wsum(terms, inmax, ones, mask):
+    """Return lanes weighted sum (int) of (terms) [(int, weight), ...] and its offset and max lane values (tuple)
+       An offset is added to every lane so that negative weights never borrow from the next lane"""
+    # ------------------------------
+    posw = sum(w for _v, w in terms if w > 0)
+    negw = -sum(w for _v, w in terms if w < 0)
+    offset = inmax * negw
+
+    pos = sum(w * v for v, w in terms if w > 0)
+    neg = sum(-w * v for v, w in terms if w < 0)
+
+    return (pos + offset * ones - neg) & mask, offset, offset + inmax * posw
+
+
+################################################################################
+
+def int_lanes(intval, cnt):
+    """Return the (cnt) 32 bits lanes values (array) of an integer"""
+    # ------------------------------
+    lanes = array('I')
+    lanes.frombytes(intval.to_bytes(cnt * 4, byteorder='little'))
+    if byteorder == 'big':
+        lanes.byteswap()
+
+    return lanes
+
+
+################################################################################
+
+def filter_lines(lines, chnlcnt, kernel, separable, divisor, bias):
+    """Return filtered lines list (bytes) of a lines band
+       (lines) holds the band lines preceded and followed by (rad) extra lines (replicated at bitmap edges)
+       (kernel) is a weights matrix, or a (horizontal, vertical) weights tuple if (separable) is set to 'True'"""
+    # ------------------------------
+    size = len(kernel[0])
+    rad = size // 2
+    cnt = len(lines[0]) // chnlcnt           # Samples per channel line
+    ones = lanes_int(bytes([1]) * cnt, 0)    # Value 1 in each lane
+    mask = (1 << (LANEBIT * cnt)) - 1
+    bandhght = len(lines) - 2 * rad
+
+    outlines = [bytearray(len(lines[0])) for _i in range(bandhght)]
+
+    for chnl in range(chnlcnt):
+        # Padded channel lines as big integers
+        rows = [lanes_int(line[chnl::chnlcnt], rad) for line in lines]
+
+        if separable:
+            # Horizontal pass then vertical pass
+            hkern, vkern = kernel
+            hrows = []
+            for row in rows:
+                terms = [(row >> (LANEBIT * j), w) for j, w in enumerate(hkern) if w != 0]
+                hrow, hoff, hmax = lanes_wsum(terms, 255, ones, mask)
+                hrows += [hrow]
+
+            # Lane value = voff + hoff * sum(vkern) + weighted sum
+            results = []
+            for y in range(bandhght):
+                terms = [(hrows[y + k], w) for k, w in enumerate(vkern) if w != 0]
+                result, voff, vmax = lanes_wsum(terms, hmax, ones, mask)
+                results += [result]
+            offset = voff + hoff * sum(vkern)
+            maxval = vmax
+
+        else:
+            # Single 2D pass
+            results = []
+            for y in range(bandhght):
+                terms = [(rows[y + k] >> (LANEBIT * j), w)
+                         for k, wrow in enumerate(kernel) for j, w in enumerate(wrow) if w != 0]
+                result, offset, maxval = lanes_wsum(terms, 255, ones, mask)
+                results += [result]
+
+        # Lane value to clamped byte lookup table
+        half = divisor // 2
+        lut = [min(255, max(0, ((v - offset + half) // divisor) + bias)) for v in range(maxval + 1)]
+
+        for y, result in enumerate(results):
+            outlines[y][chnl::chnlcnt] = bytes(map(lut.__getitem__, int_lanes(result, cnt)))
+
+    return [bytes(line) for line in outlines]
+
+
+################################################################################
+
+def apply_kernel(pic, kernel, separable, divisor, bias, workers):
+    """Apply a convolution kernel to a 8 bpp (grayscale palette) or 24 bpp bitmap, returns 'True' if success
+       Lines are split into (workers) bands, filtered in a process pool (Big integer work holds the GIL, threads wouldn't scale)"""
+    # ------------------------------
+    if pic.bitppxl == 24:
+        chnlcnt = 3
+
+    elif pic.bitppxl == 8:
+        chnlcnt = 1
+        if pic.pal[:256] != [i * 0x010101 for i in range(256)]:
+            pic.err += [("8 bpp bitmap must use a grayscale palette", "Apply Kernel")]
+            return False
+
+    else:
+        pic.err += [("Color depth must be 8 or 24 bpp", "Apply Kernel")]
+        return False
+
+    if separable:
+        sizes = [len(wrow) for wrow in kernel]
+        maxval = 255 * sum(abs(w) for w in kernel[0]) * sum(abs(w) for w in kernel[1])
+    else:
+        sizes = [len(kernel)] + [len(wrow) for wrow in kernel]
+        maxval = 255 * sum(abs(w) for wrow in kernel for w in wrow)
+
+    if len(set(sizes)) != 1 or sizes[0] % 2 == 0:
+        pic.err += [("Kernel must be a square matrix (or two lists) of odd size", "Apply Kernel")]
+        return False
+
+    if maxval >= 2 ** 24:
+        # Lanes values lookup table limit
+        pic.err += [("Kernel weights are too large", "Apply Kernel")]
+        return False
+
+    if divisor == 0:
+        # Kernel weights sum (or 1 if null)
+        if separable:
+            divisor = sum(kernel[0]) * sum(kernel[1])
+        else:
+            divisor = sum(sum(wrow) for wrow in kernel)
+        divisor = divisor if divisor > 0 else 1
+
+    rad = sizes[0] // 2
+    lines = pic.bmp_lines()
+    hght = len(lines)
+
+    # Lines bands (with extra edge lines)
+    bandcnt = max(1, min(workers, hght))
+    bounds = [(hght * i) // bandcnt for i in range(bandcnt + 1)]
+    bands = [[lines[min(max(i, 0), hght - 1)] for i in range(bounds[n] - rad, bounds[n + 1] + rad)]
+             for n in range(bandcnt)]
+
+    args = (repeat(chnlcnt), repeat(kernel), repeat(separable), repeat(divisor), repeat(bias))
+    if bandcnt == 1:
+        results = [filter_lines(bands[0], chnlcnt, kernel, separable, divisor, bias)]
+
+    else:
+        with ProcessPoolExecutor(max_workers=bandcnt) as pool:
+            results = list(pool.map(filter_lines, bands, *args))
+
+    # Write back into bitmap data (Added bytes unchanged)
+    n = 0
+    for band in results:
+        for line in band:
+            start_idx = n * pic.bytplne
+            pic.bmp[start_idx:start_idx + pic.bytplnu] = line
+            n += 1
+
+    pic.set_dirty(0, hght - 1)
+
+    return True
+
+
+################################################################################
+
+def convolve(pic, kernel, divisor=0, bias=0, workers=1):
+    """Apply a general square kernel (weights matrix) to a bitmap, returns 'True' if success
+       Pixel = (weighted sum / (divisor)) + (bias), (divisor) is the weights sum if set to 0"""
+    # ------------------------------
+    return apply_kernel(pic, kernel, False, divisor, bias, workers)
+
+
+################################################################################
+
+def convolve_sep(pic, hkernel, vkernel, divisor=0, bias=0, workers=1):
+    """Apply a separable kernel (horizontal and vertical weights lists) to a bitmap, returns 'True' if success
+       Pixel = (weighted sum / (divisor)) + (bias), (divisor) is the weights sum product if set to 0"""
+    # ------------------------------
+    return apply_kernel(pic, (hkernel, vkernel), True, divisor, bias, workers)
+
+
+################################################################################
+
+def blur(pic, size=3, workers=1):
+    """Apply a gaussian blur (size 3 or 5) to a bitmap, returns 'True' if success"""
+    # ------------------------------
+    hkern, vkern = BLUR_5 if size == 5 else BLUR_3
+    return convolve_sep(pic, hkern, vkern, 0, 0, workers)
+
+
+################################################################################
+
+def sharpen(pic, workers=1):
+    """Apply a sharpen filter to a bitmap, returns 'True' if success"""
+    # ------------------------------
+    return convolve(pic, SHARPEN_3, 0, 0, workers)
+
+
+################################################################################
+
+def edge(pic, workers=1):
+    """Apply an edge detection filter to a bitmap, returns 'True' if success"""
+    # ------------------------------
+    return convolve(pic, EDGE_3, 0, 0, workers)
+
+
+################################################################################
+#                                      EOF                                     #
+################################################################################